@@ -1,12 +1,35 @@
+import asyncio
+import json
 import re
-from typing import Optional
-from fastapi import FastAPI, HTTPException
+import uuid
+import httpx
+import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from operator import attrgetter
+from typing import Any, List, Optional
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from phi.agent import Agent, RunResponse
+from phi.memory import AgentMemory
 from phi.model.groq import Groq
-from phi.tools.duckduckgo import DuckDuckGo
-from youtube_transcript_api import YouTubeTranscriptApi
+from groq import APIError
+from groq import AsyncGroq as AsyncGroqClient
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from youtube_transcript_api import (
+    AgeRestricted,
+    CouldNotRetrieveTranscript,
+    InvalidVideoId,
+    NoTranscriptFound,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    VideoUnplayable,
+    YouTubeRequestFailed,
+    YouTubeTranscriptApi,
+)
 from youtube_transcript_api.proxies import WebshareProxyConfig
 from dotenv import load_dotenv
 import os
@@ -16,9 +39,45 @@ load_dotenv()
 
 PROXY_USERNAME = os.getenv("PROXY_USERNAME")
 PROXY_PASSWORD = os.getenv("PROXY_PASSWORD")
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+# Size of the thread pool used to run the blocking transcript fetches
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "32"))
+MODEL_ID = "llama-3.3-70b-versatile"
+# Connection pool size of the shared HTTP client used for LLM calls
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+# Number of finished summaries kept in memory, keyed by video ID (per worker process)
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "256"))
+# Long transcripts are analyzed in chunks of this many words (~2k tokens each)
+CHUNK_WORDS = int(os.getenv("CHUNK_WORDS", "1500"))
+# Maximum number of chunks of one transcript analyzed at the same time
+ANALYZER_CONCURRENCY = int(os.getenv("ANALYZER_CONCURRENCY", "4"))
+# Transcripts shorter than this (after cleaning) are rejected before any LLM call
+MIN_CAPTION_CHARS = int(os.getenv("MIN_CAPTION_CHARS", "200"))
+# Attempts (including the first) for transcript fetches and LLM calls that fail transiently
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))
+# The video really has no usable transcript (404), any other transcript error is an
+# upstream failure such as a blocked IP or a YouTube 5xx (502)
+MISSING_TRANSCRIPT_ERRORS = (
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    VideoUnavailable,
+    VideoUnplayable,
+    InvalidVideoId,
+    AgeRestricted,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await init_state()
+    except HTTPException as e:
+        # Keep serving the health check, the summarize routes report the problem
+        print("Skipping startup initialization:", e.detail)
+    yield
+    await close_state()
 
 # Initialize FastAPI
-app = FastAPI(title="PhiData YouTube Summarizer API")
+app = FastAPI(title="PhiData YouTube Summarizer API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +87,94 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+def get_proxy_config() -> Optional[WebshareProxyConfig]:
+    if not (PROXY_USERNAME and PROXY_PASSWORD):
+        print("PROXY_USERNAME/PROXY_PASSWORD not set, fetching transcripts without a proxy")
+        return None
+    return WebshareProxyConfig(
+        proxy_username=PROXY_USERNAME,
+        proxy_password=PROXY_PASSWORD,
+    )
+
+async def init_state():
+    """
+    Builds the shared clients and request state once. Runs in the lifespan
+    handler under Uvicorn, and is also a dependency of the summarize routes
+    because the Vercel serverless runtime doesn't send ASGI lifespan events.
+    """
+    # No awaits below, so concurrent first requests can't both initialize
+    if getattr(app.state, "ready", False):
+        return
+
+    # The groq SDK raises at construction without a key, fail the request instead of the app
+    if not GROQ_API_KEY:
+        raise HTTPException(status_code=503, detail="GROQ_API_KEY is not set")
+
+    # Build the SDK clients once so every request reuses their HTTP connection pools
+    app.state.ytt_api = YouTubeTranscriptApi(proxy_config=get_proxy_config())
+    # One keep-alive HTTP/2 pool for all Groq calls, so repeat requests skip the TLS handshake
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        ),
+    )
+    # The groq SDK already retries 429s, connection errors and 5xx with backoff
+    app.state.groq_client = AsyncGroqClient(
+        api_key=GROQ_API_KEY,
+        http_client=app.state.http,
+        max_retries=RETRY_ATTEMPTS - 1,
+    )
+    # Prebuilt agents, copied per run by clone_agent()
+    app.state.analyzer_template = get_analyzer(app.state.groq_client)
+    app.state.editor_template = get_editor(app.state.groq_client)
+    app.state.summaries = OrderedDict()
+    # video_id -> pipeline task currently generating its summary
+    app.state.inflight = {}
+    # video_id -> task fetching the transcript and building the Editor's input,
+    # shared by /summarize and /summarize/stream
+    app.state.inflight_context = {}
+
+    # asyncio.to_thread() runs on the loop's default executor, so sizing it here
+    # controls how many blocking transcript fetches can be in flight at once.
+    # Set last, so it only happens once everything above has been built.
+    loop = asyncio.get_running_loop()
+    if getattr(app.state, "executor_loop", None) is not loop:
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=WORKER_THREADS))
+        app.state.executor_loop = loop
+    app.state.ready = True
+
+async def close_state():
+    # Reset so a later startup in the same process builds fresh clients
+    if getattr(app.state, "ready", False):
+        app.state.ready = False
+        await app.state.http.aclose()
+
+# --- Exception Handlers ---
+@app.exception_handler(CouldNotRetrieveTranscript)
+async def transcript_unavailable(request: Request, exc: CouldNotRetrieveTranscript):
+    # The exception message embeds a long troubleshooting text, only expose the cause
+    return JSONResponse(
+        status_code=404 if isinstance(exc, MISSING_TRANSCRIPT_ERRORS) else 502,
+        content={"detail": f"Transcript unavailable: {type(exc).__name__}"},
+    )
+
+@app.exception_handler(requests.exceptions.RequestException)
+async def transcript_service_failed(request: Request, exc: requests.exceptions.RequestException):
+    # Proxy/connection failures that were still failing after the retries
+    return JSONResponse(
+        status_code=502,
+        content={"detail": f"Transcript unavailable: {type(exc).__name__}"},
+    )
+
+@app.exception_handler(APIError)
+async def ai_generation_failed(request: Request, exc: APIError):
+    return JSONResponse(
+        status_code=500,
+        content={"detail": f"AI Generation Error: {type(exc).__name__}"},
+    )
+
 # --- Pydantic Models for Input/Output ---
 class VideoRequest(BaseModel):
     url: str
@@ -36,56 +183,63 @@ class SummaryResponse(BaseModel):
     video_id: str
     summary: str
 
+# --- Structured Agent Outputs ---
+# Compact schemas keep the Editor's prompt small compared to free-form prose
+class Chapter(BaseModel):
+    title: str
+    summary: str
+
+class VideoStructure(BaseModel):
+    chapters: List[Chapter]
+    entities: List[str]
+
+class VideoInsights(BaseModel):
+    insights: List[str]
+    tone: str
+    audience: str
+    problem: str
+    solution: str
+
+class VideoAnalysis(BaseModel):
+    structure: VideoStructure
+    insights: VideoInsights
+
 # --- Helper Function: Extract Video ID ---
+# Standard (v=), Share URL (youtu.be/), Shorts (/shorts/) and embed-style paths
+_VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be\/|\/shorts\/|\/)([0-9A-Za-z_-]{11})')
+
 def get_video_id(url: str) -> Optional[str]:
     """
     Extracts video ID from standard URL, Short link, or Share link.
     """
-    patterns = [
-        r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',       # Standard & Shorts
-        r'(?:youtu\.be\/)([0-9A-Za-z_-]{11})'     # Share URL
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
-
-def get_analyst():
-    # A. The Transcript Analyst
-    return Agent(
-        name="Transcript Analyst",
-        role="Extracts logical segments and raw data from captions",
-        model=Groq(id="llama-3.3-70b-versatile"),
-        instructions=[
-            "Clean filler words from the transcript.",
-            "Divide the content into logical chapters based on the flow of conversation.",
-            "Extract all specific entities like tools, links, or names mentioned."
-        ],
-    )
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
-def get_miner():
-    # B. The Insight Miner
+def get_analyzer(client: AsyncGroqClient) -> Agent:
+    # A. The Transcript Analyzer (Analyst + Insight Miner in a single call)
     return Agent(
-        name="Insight Miner",
-        role="Identifies deep insights and the 'why' behind the video",
-        model=Groq(id="llama-3.3-70b-versatile"),
-        tools=[DuckDuckGo()],
+        name="Transcript Analyzer",
+        role="Extracts the structure of the captions and the deep insights behind the video",
+        model=Groq(id=MODEL_ID, async_client=client),
         instructions=[
+            "Divide the content into logical chapters based on the flow of conversation.",
+            "Extract all specific entities like tools, links, or names mentioned.",
             "Identify the top 3-5 unique insights or 'Gold Nuggets'.",
             "Determine the creator's tone and the target audience.",
             "Highlight the primary problem and solution discussed."
         ],
+        response_model=VideoAnalysis,
     )
 
-def get_editor():
-    # C. The Lead Editor (The Orchestrator)
+def get_editor(client: AsyncGroqClient) -> Agent:
+    # B. The Lead Editor (The Orchestrator)
     return Agent(
         name="Lead Editor",
         role="Final Writer",
-        model=Groq(id="llama-3.3-70b-versatile"),
+        model=Groq(id=MODEL_ID, async_client=client),
         instructions=[
-            "Receive the analysis from the Analyst and Miner.",
+            "Receive the analysis from the Analyzer as a JSON list of objects with 'structure' and 'insights' keys, one per consecutive section of the video.",
+            "Merge the sections into a single report, combining duplicated insights and entities.",
             "Format the final output into professional Markdown.",
             "Start with a 'TL;DR' section.",
             "Follow with a 'Detailed Breakdown' using headers.",
@@ -95,8 +249,101 @@ def get_editor():
         markdown=True,
     )
 
+def clone_agent(template: Agent) -> Agent:
+    """
+    Shallow copy of a prebuilt agent that keeps its Groq client but gets fresh
+    per-run state, so concurrent runs don't share memory, tools or metrics.
+    """
+    # Agent.deep_copy() would also deep-copy the pooled Groq client, so the model
+    # wrapper is copied shallowly and every mutable per-run field is reset instead
+    model = template.model.model_copy(update={
+        "tools": None,
+        "functions": None,
+        "function_call_stack": None,
+        "metrics": {},
+    })
+    return template.model_copy(update={
+        "model": model,
+        "memory": AgentMemory(),
+        "session_id": uuid.uuid4().hex,
+    })
+
+def to_payload(content: Any) -> Any:
+    # phi falls back to the raw string when the model output can't be parsed
+    return content.model_dump() if isinstance(content, BaseModel) else content
+
+# Hesitation sounds and auto-caption annotations like [Music] carry no content.
+# Words such as "like" or "actually" are kept since they are often meaningful, and
+# only known annotations are dropped since brackets can be content (e.g. array[0]).
+_FILLERS_RE = re.compile(
+    r'\b(?:u+m+|u+h+|e+r+m+|a+h+|h+m+)\b[,.]?'
+    r'|\[\s*(?:music|applause|laughter|laughs|inaudible|silence|cheering|crosstalk|foreign|noise)\s*\]',
+    re.IGNORECASE,
+)
+_WS_RE = re.compile(r'\s+')
+
+def clean_captions(caption_text: str) -> str:
+    return _WS_RE.sub(' ', _FILLERS_RE.sub('', caption_text)).strip()
+
+def split_captions(caption_text: str, max_words: int = CHUNK_WORDS) -> List[str]:
+    # Word count is a cheap stand-in for the token count
+    words = caption_text.split()
+    return [" ".join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+
+# --- Helper Function: Retry Transient Failures ---
+def is_transient_fetch_error(exc: BaseException) -> bool:
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    # YouTubeRequestFailed wraps any HTTPError, only 5xx responses are worth retrying
+    if isinstance(exc, YouTubeRequestFailed):
+        response = getattr(exc.__context__, "response", None)
+        return response is not None and response.status_code >= 500
+    return False
+
+async def call_with_retry(retry_if, func, *args, **kwargs):
+    """
+    Awaits an async call, retrying the failures accepted by retry_if with
+    jittered exponential backoff.
+    """
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(RETRY_ATTEMPTS),
+        wait=wait_exponential_jitter(),
+        retry=retry_if_exception(retry_if),
+        reraise=True,
+    ):
+        with attempt:
+            return await func(*args, **kwargs)
+
+# --- Helper Functions: Summary Cache ---
+def get_cached_summary(video_id: str) -> Optional[SummaryResponse]:
+    summaries: OrderedDict = app.state.summaries
+    summary = summaries.get(video_id)
+    if summary is not None:
+        summaries.move_to_end(video_id)
+    return summary
+
+def cache_summary(summary: SummaryResponse) -> None:
+    # Simple LRU: evict the least recently used entry once the cache is full
+    summaries: OrderedDict = app.state.summaries
+    summaries[summary.video_id] = summary
+    summaries.move_to_end(summary.video_id)
+    while len(summaries) > SUMMARY_CACHE_SIZE:
+        summaries.popitem(last=False)
+
+# --- Helper Function: Single-Flight ---
+def single_flight(inflight: dict, video_id: str, make_coro) -> asyncio.Task:
+    # Concurrent callers for the same video share one task instead of repeating the work
+    task = inflight.get(video_id)
+    if task is None:
+        task = asyncio.create_task(make_coro())
+        inflight[video_id] = task
+        task.add_done_callback(lambda _: inflight.pop(video_id, None))
+    else:
+        print("Joining in-flight work for video ID:", video_id)
+    return task
+
 # --- Core Logic ---
-@app.post("/summarize", response_model=SummaryResponse)
+@app.post("/summarize", response_model=SummaryResponse, dependencies=[Depends(init_state)])
 async def summarize_video(request: VideoRequest):
     
     # 1. Extract ID
@@ -104,61 +351,170 @@ async def summarize_video(request: VideoRequest):
     if not video_id:
         raise HTTPException(status_code=400, detail="Invalid YouTube URL")
 
+    # The video ID is the canonical key, so different URLs for one video share an entry
+    cached = get_cached_summary(video_id)
+    if cached is not None:
+        print("Serving cached summary for video ID:", video_id)
+        return cached
+
+    # Concurrent requests for the same video wait on a single pipeline run
+    task = single_flight(app.state.inflight, video_id, lambda: generate_summary(video_id))
+
+    # Shield so one client going away does not cancel the run for the others
+    return await asyncio.shield(task)
+
+async def fetch_captions(video_id: str) -> str:
+    # Returns a list of dicts: [{'text': 'hello', 'start': 0.0, ...}, ...]
+    # Failures surface as CouldNotRetrieveTranscript or a requests error, see the exception handlers
+    ytt_api: YouTubeTranscriptApi = app.state.ytt_api
+    print("Fetching transcript for video ID:", video_id)
+    # youtube_transcript_api is sync only, so the fetch runs on a worker thread
+    transcript_list = await call_with_retry(is_transient_fetch_error, asyncio.to_thread, ytt_api.fetch, video_id)
+    print("Transcript fetched successfully, number of snippets:", len(transcript_list))
+
+    # Combine text (Fixing the dictionary access here)
+    caption_text = " ".join(map(attrgetter("text"), transcript_list))
+
+    # Strip fillers here rather than spending LLM tokens on it
+    caption_text = clean_captions(caption_text)
+
+    # Empty or near-empty captions can't produce a useful summary, so skip the LLM spend
+    if len(caption_text) < MIN_CAPTION_CHARS:
+        raise HTTPException(status_code=422, detail="Transcript too short to summarize")
+
+    return caption_text
+
+async def analyze_chunk(chunk: str, slots: asyncio.Semaphore) -> RunResponse:
+    async with slots:
+        return await clone_agent(app.state.analyzer_template).arun(chunk, stream=False)
+
+async def build_editor_context(caption_text: str) -> str:
+    # Step 1: Analyze Structure and Mine Insights
+    # Map: each chunk of the transcript is analyzed concurrently in one LLM call
+    # Agents keep per-run memory, so each chunk gets its own copy of the template
+    chunks = split_captions(caption_text)
+    print("Running Analyzer on", len(chunks), "chunk(s)...")
+    # Bounded per transcript so a long video doesn't fire dozens of requests at the
+    # rate-limited API, without making unrelated requests queue behind each other
+    slots = asyncio.Semaphore(ANALYZER_CONCURRENCY)
+    responses: List[RunResponse] = await asyncio.gather(*(
+        analyze_chunk(chunk, slots) for chunk in chunks
+    ))
+
+    # Reduce: the partial analyses are much shorter than the raw transcript
+    return json.dumps(
+        [to_payload(response.content) for response in responses],
+        separators=(",", ":"),
+    )
+
+async def prepare_editor_context(video_id: str) -> str:
+
     # 2. Fetch Transcript
-    try:
-        # Returns a list of dicts: [{'text': 'hello', 'start': 0.0, ...}, ...]
-        ytt_api = YouTubeTranscriptApi(
-            proxy_config=WebshareProxyConfig(
-                proxy_username=PROXY_USERNAME,
-                proxy_password=PROXY_PASSWORD,
-            )
-        )
-        print("Fetching transcript for video ID:", video_id)
-        transcript_list = ytt_api.fetch(video_id)
-        print("Transcript fetched successfully, number of snippets:", len(transcript_list))
-
-        # Combine text (Fixing the dictionary access here)
-        caption_text = " ".join([snippet.text for snippet in transcript_list])
-        
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Transcript unavailable: {str(e)}")
+    caption_text = await fetch_captions(video_id)
 
     # 3. Run the Agent Team
+    # --- PIPELINE EXECUTION ---
+    return await build_editor_context(caption_text)
+
+async def get_editor_context(video_id: str) -> str:
+    task = single_flight(app.state.inflight_context, video_id, lambda: prepare_editor_context(video_id))
+    return await asyncio.shield(task)
+
+async def generate_summary(video_id: str) -> SummaryResponse:
+    combined_context = await get_editor_context(video_id)
+
+    # Step 2: Final Edit
+    editor = clone_agent(app.state.editor_template)
+    print("Running Editor...")
+    final_response: RunResponse = await editor.arun(combined_context, stream=False)
+    if not final_response.content:
+        raise HTTPException(status_code=500, detail="AI Generation Error: empty response")
+
+    # Return the content content
+    response = SummaryResponse(
+        video_id=video_id,
+        summary=final_response.content
+    )
+    cache_summary(response)
+    return response
+
+# --- Streaming ---
+def sse_event(data: str, event: Optional[str] = None) -> str:
+    # Every line of a multi-line payload needs its own "data:" prefix
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+async def stream_summary(video_id: str, combined_context: str, queue: asyncio.Queue) -> SummaryResponse:
+    # Runs as a task registered in app.state.inflight, so /summarize requests can join
+    # it and a disconnecting client doesn't abort the generation for them
+    editor = clone_agent(app.state.editor_template)
+    parts: List[str] = []
     try:
-        # --- PIPELINE EXECUTION ---
-
-        # Step 1: Analyze Structure
-        analyst = get_analyst()
-        print("Running Analyst...")
-        analyst_response: RunResponse = analyst.run(caption_text, stream=False)
-        raw_structure = analyst_response.content
-
-        # Step 2: Mine Insights
-        miner = get_miner()
-        print("Running Miner...")
-        miner_response: RunResponse = miner.run(caption_text, stream=False)
-        raw_insights = miner_response.content
-
-        # Step 3: Final Edit
-        # We combine the outputs from step 1 & 2 manually
-        combined_context = (
-            f"Here is the structural analysis of the video:\n{raw_structure}\n\n"
-            f"Here are the deep insights found:\n{raw_insights}\n\n"
-            "Please compile this into the final report."
-        )
-
-        editor = get_editor()
-        print("Running Editor...")
-        final_response: RunResponse = editor.run(combined_context, stream=False)
-        
-        # Return the content content
-        return SummaryResponse(
-            video_id=video_id,
-            summary=final_response.content
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI Generation Error: {str(e)}")
+        print("Streaming Editor...")
+        chunks = await editor.arun(combined_context, stream=True)
+        async for chunk in chunks:
+            if chunk.content:
+                parts.append(chunk.content)
+                queue.put_nowait(chunk.content)
+    finally:
+        # End of stream marker
+        queue.put_nowait(None)
+
+    # Don't let an empty generation be served from the cache afterwards
+    if not parts:
+        raise HTTPException(status_code=500, detail="AI Generation Error: empty response")
+
+    response = SummaryResponse(video_id=video_id, summary="".join(parts))
+    cache_summary(response)
+    return response
+
+def summary_events(summary: SummaryResponse) -> StreamingResponse:
+    events = [sse_event(summary.summary), sse_event("", event="done")]
+    return StreamingResponse(iter(events), media_type="text/event-stream")
+
+@app.post("/summarize/stream", dependencies=[Depends(init_state)])
+async def summarize_video_stream(request: VideoRequest):
+    """
+    Same pipeline as /summarize, but the Editor's Markdown is sent as
+    Server-Sent Events while it is being generated.
+    """
+    video_id = get_video_id(request.url)
+    if not video_id:
+        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+
+    cached = get_cached_summary(video_id)
+    if cached is not None:
+        print("Serving cached summary for video ID:", video_id)
+        return summary_events(cached)
+
+    # Errors before the Editor starts are still reported as regular HTTP errors
+    inflight: dict = app.state.inflight
+    if video_id not in inflight:
+        combined_context = await get_editor_context(video_id)
+
+    # A run already in progress (from either endpoint) finishes sooner than starting over
+    task = inflight.get(video_id)
+    if task is not None:
+        print("Joining in-flight summary for video ID:", video_id)
+        return summary_events(await asyncio.shield(task))
+
+    queue: asyncio.Queue = asyncio.Queue()
+    task = single_flight(inflight, video_id, lambda: stream_summary(video_id, combined_context, queue))
+
+    async def event_stream():
+        while (text := await queue.get()) is not None:
+            yield sse_event(text)
+        try:
+            await asyncio.shield(task)
+        except Exception as e:
+            # The response has already started, so the error is reported in-band
+            detail = e.detail if isinstance(e, HTTPException) else f"AI Generation Error: {type(e).__name__}"
+            yield sse_event(detail, event="error")
+            return
+        yield sse_event("", event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 # --- Health Check ---
 @app.get("/")
@@ -175,23 +531,3 @@ class Item(BaseModel):
 async def create_item(item: Item):
     return item
 
-
-# Sample code to test fetching transcript and running the agent
-# video_id = "JDYtbVxtBhw"
-
-# ytt_api = YouTubeTranscriptApi()
-# transcript = ytt_api.fetch(video_id)
-
-# #Convert to plain text
-# caption_text = " ".join([snippet.text for snippet in transcript])
-
-#print(caption_text)
-
-
-# Get the response in a variable
-# run: RunResponse = editor.run(caption_text)
-# print(run.content)
-
-
-# Print the response in the terminal
-#editor.print_response(caption_text)
\ No newline at end of file